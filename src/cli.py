@@ -1,13 +1,11 @@
 import argparse
 import logging
 import shutil
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from src.config import settings
-from src.database import get_db
+from src.config import get_settings
 from src.logging_config import setup_logging
-from src.processors.mattermost import process_mattermost_posts
-from src.processors.teamly import process_teamly_documents
-from src.processors.hr_sheet import process_hr_sheet
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +13,57 @@ logger = logging.getLogger(__name__)
 def initialize() -> None:
     setup_logging()
 
-    settings.logs_dir.mkdir(exist_ok=True)
-    settings.secrets_dir.mkdir(exist_ok=True)
+    settings = get_settings()
+    # Only the contents of temp_dir are removed; the directory itself is kept.
+    if settings.temp_dir.is_dir():
+        for entry in settings.temp_dir.iterdir():
+            if entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+
+    # Missing parents, including temp_dir on a first run, are created along the way.
+    for directory in (
+        settings.logs_dir,
+        settings.secrets_dir,
+        settings.mattermost_temp_dir,
+        settings.teamly_temp_dir,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+# Processor modules are imported on demand, so a run only loads the clients it uses.
+def run_mattermost() -> None:
+    from src.database import SessionLocal, engine
+    from src.processors.mattermost import process_mattermost_posts
+
+    # Sessions are not thread-safe, so the processor gets one of its own.
+    db_session = SessionLocal()
+    try:
+        process_mattermost_posts(db_session)
+    finally:
+        db_session.close()
+        # Mattermost is the only processor using the database.
+        engine.dispose()
+        logger.info("Mattermost database session closed.")
+
+
+def run_teamly() -> None:
+    from src.processors.teamly import process_teamly_documents
+
+    process_teamly_documents()
+
 
-    if settings.temp_dir.exists():
-        shutil.rmtree(settings.temp_dir)
+def run_hr() -> None:
+    from src.processors.hr_sheet import process_hr_sheet
 
-    settings.temp_dir.mkdir(exist_ok=True)
-    settings.mattermost_temp_dir.mkdir(exist_ok=True)
-    settings.teamly_temp_dir.mkdir(exist_ok=True)
+    process_hr_sheet()
+
+
+def run_processor(name: str, func: Callable[[], None]) -> None:
+    logger.info(f"Starting {name} knowledge base generation.")
+    func()
+    logger.info(f"{name} knowledge base generation finished.")
 
 
 def main() -> None:
@@ -45,29 +85,26 @@ def main() -> None:
     initialize()
     logger.info("Starting knowledge base generation.")
 
-    run_mattermost = "mattermost" in processors_to_run
-    run_teamly = "teamly" in processors_to_run
-    run_hr = "hr" in processors_to_run
-
-    db_session = next(get_db())
-    try:
-        if run_mattermost:
-            logger.info("Starting Mattermost knowledge base generation.")
-            process_mattermost_posts(db_session)
-            logger.info("Mattermost knowledge base generation finished.")
-
-        if run_teamly:
-            logger.info("Starting Teamly knowledge base generation.")
-            process_teamly_documents()
-            logger.info("Teamly knowledge base generation finished.")
-
-        if run_hr:
-            logger.info("Starting HR sheet knowledge base generation.")
-            process_hr_sheet()
-            logger.info("HR sheet knowledge base generation finished.")
-
-    except Exception as e:
-        logger.critical(f"An unhandled error occurred: {e}", exc_info=True)
-    finally:
-        db_session.close()
-        logger.info("Knowledge base generation finished. Database session closed.")
+    tasks: list[tuple[str, Callable[[], None]]] = []
+    if "mattermost" in processors_to_run:
+        tasks.append(("Mattermost", run_mattermost))
+    if "teamly" in processors_to_run:
+        tasks.append(("Teamly", run_teamly))
+    if "hr" in processors_to_run:
+        tasks.append(("HR sheet", run_hr))
+
+    # The processors talk to independent systems, so their I/O waits can overlap.
+    with ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+        futures = {
+            executor.submit(run_processor, name, func): name for name, func in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.critical(
+                    f"An unhandled error occurred in {futures[future]} processor: {e}",
+                    exc_info=True,
+                )
+
+    logger.info("Knowledge base generation finished.")
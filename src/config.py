@@ -1,9 +1,14 @@
+from functools import cached_property, lru_cache
 from pathlib import Path
 
-from pydantic import computed_field
+from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+_CONFIG_FILE = Path(__file__)
+# __file__ is already absolute under normal imports; resolve() only when it is not.
+if not _CONFIG_FILE.is_absolute():
+    _CONFIG_FILE = _CONFIG_FILE.resolve()
+BASE_DIR = _CONFIG_FILE.parent.parent
 TEMP_DIR = BASE_DIR / "temp"
 MATTERMOST_TEMP_DIR = TEMP_DIR / "mattermost"
 TEAMLY_TEMP_DIR = TEMP_DIR / "teamly"
@@ -19,20 +24,25 @@ class DatabaseSettings(BaseSettings):
     password: str
     host: str
     port: int
+    pool_size: int = 20
+    max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 3600
 
     model_config = SettingsConfigDict(
         env_file=ENV_FILE, env_prefix="DB_", extra="ignore"
     )
 
-    @computed_field
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
     def mysql_connection_str(self) -> str:
         return (
             f"mysql+pymysql://"
-            f"{settings.db.user}:"
-            f"{settings.db.password}@"
-            f"{settings.db.host}:"
-            f"{settings.db.port}/"
-            f"{settings.db.name}"
+            f"{self.user}:"
+            f"{self.password}@"
+            f"{self.host}:"
+            f"{self.port}/"
+            f"{self.name}"
         )
 
 
@@ -56,19 +66,25 @@ class Settings(BaseSettings):
     google_sheets_hr_sheet_gid: int
     google_sheets_hr_range: str
     google_drive_hr_processed_dir_id: str
+    # Number of concurrent Drive uploads; 1 uploads files one after another.
+    google_drive_upload_concurrency: int = 4
 
     teamly_space_id: str
     teamly_api_slug: str
     teamly_api_client_id: str
     teamly_api_client_secret: str
 
-    db: DatabaseSettings = DatabaseSettings()  # noqa
+    db: DatabaseSettings = Field(default_factory=DatabaseSettings)
 
     model_config = SettingsConfigDict(env_file=ENV_FILE, extra="ignore")
 
-    @computed_field
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
     def google_account_file(self) -> Path:
         return self.secrets_dir / self.google_account_file_name
 
 
-settings = Settings()  # noqa
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings on first use and reuse them for the rest of the process."""
+    return Settings()  # noqa
@@ -1,47 +1,61 @@
-TEAMLY_EXCLUDED_ARTICLE_IDS = {
-    "5224c0f5-9d25-47c2-85ef-b2b4d36b8bcd",
-    "5a9cb2ed-08d4-48f7-91f3-c165f57be894",
-    "36b78dff-2d9d-4340-aad3-da84d15f7054",
-    "b1366b31-75b1-4fc9-964f-f8ab6bf9a149",
-    "059a5e82-38d0-40cb-8d75-923fc78b4358",
-    "56ac59a8-9cc6-4afc-91eb-d322239543ef",
-    "47778466-920e-4676-96b0-9709be8fa0b4",
-    "aff5ea64-3144-46ca-ba8b-587fc461dae6",
-    "c1282b12-5be4-4dac-8658-a37d91812653",
-    "ad030e5b-de94-40c7-8656-22587f862d95",
-    "3a79c74f-0844-4f31-878d-7adf49e5b366",
-    "e90e247f-c1b4-4c86-a7c3-b6601993224e",
-    "5040ed1b-0387-42fd-898c-ddd5056d7063",
-    "b13e2ed4-5c42-4ff7-850d-9d3ca1bc1867",
-    "aaf663d9-4433-410a-bf56-6e0fc30831e1",
-    "bb264857-da57-4fd0-9bce-44c1925b3a60",
-    "532c5e2b-a1a5-4e3a-967c-a2d3a8ec72d9",
-    "aa081bfa-8d9a-4a40-90c6-c68049425c3c",
-    "88c260e3-f782-420e-b1b1-a466eb8f5382",
-}
+TEAMLY_EXCLUDED_ARTICLE_IDS = frozenset(
+    {
+        "5224c0f5-9d25-47c2-85ef-b2b4d36b8bcd",
+        "5a9cb2ed-08d4-48f7-91f3-c165f57be894",
+        "36b78dff-2d9d-4340-aad3-da84d15f7054",
+        "b1366b31-75b1-4fc9-964f-f8ab6bf9a149",
+        "059a5e82-38d0-40cb-8d75-923fc78b4358",
+        "56ac59a8-9cc6-4afc-91eb-d322239543ef",
+        "47778466-920e-4676-96b0-9709be8fa0b4",
+        "aff5ea64-3144-46ca-ba8b-587fc461dae6",
+        "c1282b12-5be4-4dac-8658-a37d91812653",
+        "ad030e5b-de94-40c7-8656-22587f862d95",
+        "3a79c74f-0844-4f31-878d-7adf49e5b366",
+        "e90e247f-c1b4-4c86-a7c3-b6601993224e",
+        "5040ed1b-0387-42fd-898c-ddd5056d7063",
+        "b13e2ed4-5c42-4ff7-850d-9d3ca1bc1867",
+        "aaf663d9-4433-410a-bf56-6e0fc30831e1",
+        "bb264857-da57-4fd0-9bce-44c1925b3a60",
+        "532c5e2b-a1a5-4e3a-967c-a2d3a8ec72d9",
+        "aa081bfa-8d9a-4a40-90c6-c68049425c3c",
+        "88c260e3-f782-420e-b1b1-a466eb8f5382",
+    }
+)
 
-MATTERMOST_CHANNEL_IDS = {
-    "z5t5hy9h6fbdjxk3eaw1qsikdo",  # ~town-square
-    "ykt6smajcp857frb1cpsmqhdpy",  # ~teamleaders-retro-for-team
-    "utcs94emzjdypnpuzrtkzw8n1a",  # ~tasks
-    "rxa4r4zocfb7u8cxw1hwax3kkw",  # ~marketing
-    "stgx99dyu7fr3er3igj65wg4ga",  # ~agreements
-    "doxebjbssbre3r1yyze5ntzhrr",  # ~sales
-    "c73q3ike5ffzxmgaey6qmqu7zo",  # ~inbound
-    "iwcocsm6gpnc7fnex77a8awh7c",  # ~outbound
-    "hzmsuyno1tbdjyfi84ui4pmq5e",  # ~serm
-    "d9mygh6boproxp3ynzeff3digw",  # ~team-performance
-    "xpcpu3sgmffutkfrfz4gzah3wr",  # ~team-market-research
-    "suqtintohiyr3bt36mh3zsdjqo",  # ~leadgen-fundraising
-    "zrgtwgw8dt87tx7nbcf8d171nw",  # ~sales-tenders
-    "jddra1sbrf8qjpnxfbcdbquk5e",  # ~outreach-support-mr
-    "rt7678awpinnijupi94t7tkjxw",  # ~im
-}
+MATTERMOST_CHANNEL_IDS = frozenset(
+    {
+        "z5t5hy9h6fbdjxk3eaw1qsikdo",  # ~town-square
+        "ykt6smajcp857frb1cpsmqhdpy",  # ~teamleaders-retro-for-team
+        "utcs94emzjdypnpuzrtkzw8n1a",  # ~tasks
+        "rxa4r4zocfb7u8cxw1hwax3kkw",  # ~marketing
+        "stgx99dyu7fr3er3igj65wg4ga",  # ~agreements
+        "doxebjbssbre3r1yyze5ntzhrr",  # ~sales
+        "c73q3ike5ffzxmgaey6qmqu7zo",  # ~inbound
+        "iwcocsm6gpnc7fnex77a8awh7c",  # ~outbound
+        "hzmsuyno1tbdjyfi84ui4pmq5e",  # ~serm
+        "d9mygh6boproxp3ynzeff3digw",  # ~team-performance
+        "xpcpu3sgmffutkfrfz4gzah3wr",  # ~team-market-research
+        "suqtintohiyr3bt36mh3zsdjqo",  # ~leadgen-fundraising
+        "zrgtwgw8dt87tx7nbcf8d171nw",  # ~sales-tenders
+        "jddra1sbrf8qjpnxfbcdbquk5e",  # ~outreach-support-mr
+        "rt7678awpinnijupi94t7tkjxw",  # ~im
+    }
+)
 
 HR_SPLIT_FILES_COUNT = 10
 
+# Number of Mattermost channels processed concurrently; each worker holds one DB connection.
+MATTERMOST_CHANNEL_WORKERS = 8
+
 # The total period in days for which messages are retrieved.
 TOTAL_SEARCH_PERIOD_DAYS = 90
 # The size of the data "chunk" for processing at one time, in days.
 PROCESSING_CHUNK_DAYS = 90
 TEAMLY_COMBINE_FILES = True
+# Number of Teamly article details fetched concurrently.
+TEAMLY_DETAIL_WORKERS = 8
+# Minimum delay between two Teamly API calls, shared by all worker threads
+# (at most 5 requests per second).
+TEAMLY_REQUEST_INTERVAL = 0.2
+# Write buffer for generated knowledge files, so each file is flushed in a few large writes.
+FILE_WRITE_BUFFER_SIZE = 1 << 20
@@ -3,10 +3,22 @@ from typing import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
-from src.config import settings
+from src.config import get_settings
 
-engine = create_engine(settings.db.mysql_connection_str)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+db_settings = get_settings().db
+engine = create_engine(
+    db_settings.mysql_connection_str,
+    # Enough connections for the concurrent Mattermost channel workers.
+    pool_size=db_settings.pool_size,
+    max_overflow=db_settings.max_overflow,
+    pool_pre_ping=db_settings.pool_pre_ping,
+    pool_recycle=db_settings.pool_recycle,
+    pool_use_lifo=True,
+)
+# Sessions only read, so there is nothing to expire after a commit.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -1,6 +1,6 @@
 import logging
 
-from src.config import settings
+from src.config import get_settings
 
 
 _LOGGING_CONFIGURED = False
@@ -12,6 +12,7 @@ def setup_logging() -> None:
     if _LOGGING_CONFIGURED:
         return
 
+    settings = get_settings()
     settings.logs_dir.mkdir(parents=True, exist_ok=True)
     log_file = settings.logs_dir / "app.log"
 
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 
 Base = declarative_base()
 
@@ -24,10 +25,11 @@ class Post(Base):
     OriginalId = Column(String(26), nullable=True)
     Message = Column(Text)
     Type = Column(String(50))
-    Props = Column(JSON)
+    # JSON columns are not used by the processors; they load only when accessed.
+    Props = deferred(Column(JSON))
     Hashtags = Column(Text, nullable=True)
-    Filenames = Column(JSON)
-    FileIds = Column(JSON)
+    Filenames = deferred(Column(JSON))
+    FileIds = deferred(Column(JSON))
     HasReactions = Column(Boolean)
     EditAt = Column(BigInteger)
     IsPinned = Column(Boolean)
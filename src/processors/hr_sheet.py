@@ -1,64 +1,119 @@
+import io
 import logging
 import re
 import math
-from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Optional, Tuple
 
-from src.config import settings
+from src.config import get_settings
 from src.constants import HR_SPLIT_FILES_COUNT
 from src.logging_config import setup_logging
 from src.processors.base import BaseProcessor
 from src.utils.gdrive_utils import (
     get_gdrive_service,
-    upload_file_to_gdrive,
+    upload_files_to_gdrive,
     delete_files_in_folder,
 )
 from src.utils.gsheets_utils import get_gsheets_service, read_sheet_values
 
 logger = logging.getLogger(__name__)
 
+# Front matter shared by every generated HR file; it does not depend on the chunk.
+HR_METADATA = (
+    "---\n"
+    "source: HR\n"
+    "category: HR lifecycle\n"
+    "tz: Europe/Moscow\n"
+    "body_format: kv-lines\n"
+    "body_format_fields:\n"
+    "  person: Employee name\n"
+    "  current_position: Current position/title\n"
+    "  department: Department\n"
+    "  team_lead: Team lead\n"
+    "  start_date: Employment start date\n"
+    "  probation_end: Probation end date\n"
+    "  probation_passed: Probation passed status\n"
+    "  termination_status: Termination status\n"
+    "  termination_date: Termination date\n"
+    "  termination_reason: Termination reason\n"
+    "---\n\n"
+)
+
+_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+_DMY_DATE_RE = re.compile(r"^(\d{2})\.(\d{2})\.(\d{4})$")
+# Sort key of entries without a parseable date, placing them after all dated ones.
+UNDATED_SORT_KEY = "9999-12-31"
+
 
 def normalize_header(header: str) -> str:
     return header.strip().lower()
 
 
-def parse_hr_rows(values: List[List[str]]) -> List[Dict[str, Any]]:
+def parse_hr_rows(
+    values: List[List[str]],
+) -> Tuple[Dict[str, Tuple[int, ...]], List[List[str]]]:
+    """
+    Split sheet values into a normalized header -> column indices map and the data rows.
+    Indices of repeated headers are listed last column first.
+    """
     if not values:
-        return []
-    headers = [normalize_header(h) for h in values[0]]
-    data_rows = []
-    for row in values[1:]:
-        entry: Dict[str, Any] = {}
-        for idx, col in enumerate(row):
-            if idx >= len(headers):
-                continue
-            key = headers[idx]
-            entry[key] = col.strip()
-        data_rows.append(entry)
-    return data_rows
+        return {}, []
+    columns: Dict[str, Tuple[int, ...]] = {}
+    for idx, header in enumerate(values[0]):
+        key = normalize_header(header)
+        columns[key] = (idx, *columns.get(key, ()))
+    return columns, values[1:]
+
+
+def _cell(row: List[str], cols: Tuple[int, ...]) -> str:
+    # The last matching column present in the row wins, as with a header -> value dict.
+    for col in cols:
+        if col < len(row):
+            return row[col].strip()
+    return ""
+
+
+def _first(row: List[str], *aliases: Tuple[int, ...]) -> str:
+    # First non-empty value among alternative headers of the same field.
+    for cols in aliases:
+        value = _cell(row, cols)
+        if value:
+            return value
+    return ""
+
+
+def extract_kv_lines(
+    rows: List[List[str]], columns: Dict[str, Tuple[int, ...]]
+) -> List[Tuple[str, Optional[str]]]:
+    # Resolve column positions once instead of looking fields up per row.
+    name_cols = columns.get("имя", ())
+    name_alt_cols = columns.get("name", ())
+    direction_cols = columns.get("направление", ())
+    teamlead_cols = columns.get("тимлид", ())
+    current_position_cols = columns.get("текущая позиция", ())
+    position_cols = columns.get("позиция", ())
+    start_date_cols = columns.get("дата начала работы", ())
+    probation_start_cols = columns.get("начало ис", ())
+    probation_end_cols = columns.get("конец ис", ())
+    probation_passed_cols = columns.get("ис пройден", ())
+    termination_status_cols = columns.get("увольнение", ())
+    termination_reason_cols = columns.get("причина увольнения", ())
+    termination_date_cols = columns.get("дата", ())
+    contract_end_cols = columns.get("дата расторжения договора", ())
 
-
-def extract_kv_lines(entries: List[Dict[str, Any]]) -> List[Tuple[str, Optional[str]]]:
     lines: List[Tuple[str, Optional[str]]] = []
-    for e in entries:
-        name = e.get("имя", "").strip() or e.get("name", "").strip()
+    for row in rows:
+        name = _first(row, name_cols, name_alt_cols)
         if not name:
             continue
-        direction = e.get("направление", "").strip()
-        teamlead = e.get("тимлид", "").strip()
-        current_position = (
-            e.get("текущая позиция", "").strip() or e.get("позиция", "").strip()
-        )
-        start_date = (
-            e.get("дата начала работы", "").strip() or e.get("начало ис", "").strip()
-        ) or None
-        probation_end = e.get("конец ис", "").strip()
-        probation_passed = e.get("ис пройден", "").strip()
-        termination_status = e.get("увольнение", "").strip()
-        termination_reason = e.get("причина увольнения", "").strip()
-        termination_date = (
-            e.get("дата", "").strip() or e.get("дата расторжения договора", "").strip()
-        ) or None
+        direction = _cell(row, direction_cols)
+        teamlead = _cell(row, teamlead_cols)
+        current_position = _first(row, current_position_cols, position_cols)
+        start_date = _first(row, start_date_cols, probation_start_cols) or None
+        probation_end = _cell(row, probation_end_cols)
+        probation_passed = _cell(row, probation_passed_cols)
+        termination_status = _cell(row, termination_status_cols)
+        termination_reason = _cell(row, termination_reason_cols)
+        termination_date = _first(row, termination_date_cols, contract_end_cols) or None
 
         parts: List[str] = [f"person: {name}"]
         if current_position:
@@ -85,6 +140,19 @@ def extract_kv_lines(entries: List[Dict[str, Any]]) -> List[Tuple[str, Optional[
     return lines
 
 
+def parse_date(date_str: Optional[str]) -> Optional[str]:
+    """Normalize a YYYY-MM-DD or DD.MM.YYYY sheet date to YYYY-MM-DD."""
+    if not date_str:
+        return None
+    s = date_str.strip()
+    if _ISO_DATE_RE.match(s):
+        return s
+    m = _DMY_DATE_RE.match(s)
+    if m:
+        return f"{m.group(3)}-{m.group(2)}-{m.group(1)}"
+    return None
+
+
 def process_hr_sheet() -> None:
     """Entrypoint wrapper for class-based HR processing."""
     setup_logging()
@@ -96,6 +164,7 @@ class HRSheetProcessor(BaseProcessor):
     """Process HR Google Sheet into knowledge text."""
 
     def run(self) -> None:
+        settings = get_settings()
         if (
             not settings.google_sheets_hr_spreadsheet_id
             or not settings.google_drive_hr_processed_dir_id
@@ -140,33 +209,20 @@ class HRSheetProcessor(BaseProcessor):
                 "HR sheet does not have enough rows after skipping the first row."
             )
             return
-        entries = parse_hr_rows(values[1:])
-        kv_lines = extract_kv_lines(entries)
-
-        def parse_date(date_str: Optional[str]) -> Optional[str]:
-            if not date_str:
-                return None
-            s = date_str.strip()
-            # Try YYYY-MM-DD
-            m = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", s)
-            if m:
-                return s
-            # Try DD.MM.YYYY
-            m = re.match(r"^(\d{2})\.(\d{2})\.(\d{4})$", s)
-            if m:
-                return f"{m.group(3)}-{m.group(2)}-{m.group(1)}"
-            return None
-
-        dated_items: List[Tuple[str, Optional[str]]] = [
-            (text, parse_date(dt)) for text, dt in kv_lines
+        columns, rows = parse_hr_rows(values[1:])
+        kv_lines = extract_kv_lines(rows, columns)
+
+        # (date, text) pairs sort by date, then text, with undated entries last.
+        dated_items: List[Tuple[str, str]] = [
+            (parse_date(dt) or UNDATED_SORT_KEY, text) for text, dt in kv_lines
         ]
-        dated_items.sort(key=lambda x: (x[1] or "9999-12-31", x[0]))
+        dated_items.sort()
 
         split_count = HR_SPLIT_FILES_COUNT
         if split_count < 1:
             split_count = 1
 
-        chunks: List[List[Tuple[str, Optional[str]]]] = []
+        chunks: List[List[Tuple[str, str]]] = []
         if split_count == 1:
             chunks = [dated_items]
         else:
@@ -182,32 +238,14 @@ class HRSheetProcessor(BaseProcessor):
             logger.info("No HR entries to write.")
             return
 
-        (settings.hr_temp_dir).mkdir(parents=True, exist_ok=True)
-
+        # The files are small, so they are uploaded straight from memory.
+        uploads: List[Tuple[io.BytesIO, str]] = []
         for idx, chunk in enumerate(chunks, start=1):
             if not chunk:
                 continue
-            first_dt = next((d for _, d in chunk if d), None) or "unknown"
-            last_dt = next((d for _, d in reversed(chunk) if d), None) or "unknown"
-
-            metadata = (
-                "---\n"
-                "source: HR\n"
-                "category: HR lifecycle\n"
-                "tz: Europe/Moscow\n"
-                "body_format: kv-lines\n"
-                "body_format_fields:\n"
-                "  person: Employee name\n"
-                "  current_position: Current position/title\n"
-                "  department: Department\n"
-                "  team_lead: Team lead\n"
-                "  start_date: Employment start date\n"
-                "  probation_end: Probation end date\n"
-                "  probation_passed: Probation passed status\n"
-                "  termination_status: Termination status\n"
-                "  termination_date: Termination date\n"
-                "  termination_reason: Termination reason\n"
-                "---\n\n"
+            first_dt = next((d for d, _ in chunk if d != UNDATED_SORT_KEY), "unknown")
+            last_dt = next(
+                (d for d, _ in reversed(chunk) if d != UNDATED_SORT_KEY), "unknown"
             )
 
             # Deprecated old suffix logic; using Variant 1 naming
@@ -217,24 +255,13 @@ class HRSheetProcessor(BaseProcessor):
                 file_name = f"{base_name}__part_{idx}_of_{total_parts}.txt"
             else:
                 file_name = f"{base_name}.txt"
-            output_path: Path = settings.hr_temp_dir / file_name
-            try:
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(metadata)
-                    f.write("\n".join(text for text, _ in chunk))
-                logger.info(f"Generated HR knowledge file: {output_path}")
-
-                logger.info(
-                    f"Uploading {output_path.name} to Google Drive as a Google Doc..."
-                )
-                upload_file_to_gdrive(
-                    gdrive,
-                    output_path,
-                    settings.google_drive_hr_processed_dir_id,
-                    as_gdoc=True,
-                )
-            except OSError as e:
-                logger.error(f"Error writing HR knowledge file {output_path}: {e}")
+
+            content = HR_METADATA + "\n".join(text for _, text in chunk)
+            uploads.append((io.BytesIO(content.encode("utf-8")), file_name))
+
+        upload_files_to_gdrive(
+            gdrive, uploads, settings.google_drive_hr_processed_dir_id, as_gdoc=True
+        )
 
 
 if __name__ == "__main__":
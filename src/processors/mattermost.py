@@ -1,20 +1,23 @@
 import datetime
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
 
-import markdown
-from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
-from src.config import settings
+from src.config import get_settings
 from src.constants import (
+    FILE_WRITE_BUFFER_SIZE,
     MATTERMOST_CHANNEL_IDS,
+    MATTERMOST_CHANNEL_WORKERS,
     TOTAL_SEARCH_PERIOD_DAYS,
     PROCESSING_CHUNK_DAYS,
 )
-from src.database import get_db
+from src.database import SessionLocal, get_db
 from src.logging_config import setup_logging
-from src.models import Post
 from src.processors.base import BaseProcessor
 from src.repository import PostRepository
 from src.utils.datetime_utils import (
@@ -24,33 +27,120 @@ from src.utils.datetime_utils import (
 )
 from src.utils.gdrive_utils import (
     get_gdrive_service,
-    upload_file_to_gdrive,
+    upload_files_to_gdrive,
     delete_files_in_folder,
 )
 
 logger = logging.getLogger(__name__)
 
+_MENTION_RE = re.compile(r"@[a-zA-Z0-9_.]+")
+# Emoji code point ranges (inclusive) removed from messages.
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),
+    (0x1F300, 0x1F5FF),
+    (0x1F680, 0x1F6FF),
+    (0x1F1E0, 0x1F1FF),
+    (0x1F900, 0x1F9FF),
+    (0x2600, 0x27BF),
+)
+_EMOJI_RE = re.compile(
+    "[" + "".join(f"{chr(start)}-{chr(end)}" for start, end in _EMOJI_RANGES) + "]+"
+)
+# Emphasis content: anything up to the closing marker, but not across a blank line.
+_MD_SPAN = r"((?:[^\n]|\n(?![ \t]*\n))+?)"
+_MD_STRIP_RE = re.compile(
+    r"```(?:[^\n`]*\n)?(.*?)```"  # fenced code, language tag dropped
+    # Inline code is closed by a backtick run of the same length, so an unclosed
+    # fence stays text instead of pairing its first two backticks.
+    r"|(?<!`)(`+)(?!`)" + _MD_SPAN + r"(?<!`)\2(?!`)"
+    r"|\\([\\`*_{}\[\]()#+\-.!>])"  # backslash escape, keep the character
+    # Link, keep its text; the URL may hold one level of parentheses.
+    r"|\[([^\]]*)\]\((?:[^()]|\([^()]*\))*\)"
+    r"|<((?:https?|ftp)://[^>\s]+|mailto:[^>\s]+|[^\s<>@]+@[^\s<>]+)>"  # autolink
+    # Emphasis and strikethrough only when the marker is closed again. Markers must
+    # sit at word boundaries, so snake_case, __init__.py, 2*3*4 or a~~b~~c are left
+    # alone.
+    r"|(?<![\w*\\])(\*\*\*?)(?![\s*])" + _MD_SPAN + r"(?<=[^\s*\\])\7(?![\w*])"
+    r"|(?<![\w*\\])(\*)(?![\s*])" + _MD_SPAN + r"(?<=[^\s*\\])\9(?![\w*])"
+    r"|(?<![\w\\])(_{1,3})(?![\s_])" + _MD_SPAN + r"(?<=[^\s_\\])\11(?![\w.]\w|\w)"
+    r"|(?<![\w~\\])(~~)(?![\s~])" + _MD_SPAN + r"(?<=[^\s~\\])\13(?![\w~])"
+    r"|</?[A-Za-z][^>]*>"  # raw HTML tags; a lone < or > is ordinary text
+    r"|^[ \t]*(?:#+\s|>+[ \t]?)",  # heading and blockquote markers
+    re.DOTALL | re.MULTILINE,
+)
+# Groups of _MD_STRIP_RE whose text is kept as is, and those holding emphasised text.
+_MD_KEPT_GROUPS = (1, 3, 4, 5, 6)
+_MD_EMPHASIS_GROUPS = (8, 10, 12, 14)
+# Characters that can start a construct matched by _MD_STRIP_RE.
+_MD_MARKERS = frozenset("`*_~[<#>\\")
+# Runs of characters not allowed in generated file names.
+_SAFE_NAME_RE = re.compile(r"[^\w\-_. ]+")
+
+# Front matter of a channel file; only the channel and the date range vary.
+MATTERMOST_METADATA_TEMPLATE = (
+    "---\n"
+    "source: Mattermost\n"
+    "channel: {channel}\n"
+    "tz: Europe/Moscow\n"
+    "date_range:\n"
+    "  start: {start}\n"
+    "  end: {end}\n"
+    "body_format: kv-lines\n"
+    "body_format_fields:\n"
+    "  datetime: Message date and time (MSK)\n"
+    "  user: Mattermost username\n"
+    "  message: Message text (cleaned)\n"
+    "---\n\n"
+)
+
 
+def _strip_markdown_match(match: re.Match[str]) -> str:
+    for group in _MD_KEPT_GROUPS:
+        kept = match.group(group)
+        if kept is not None:
+            return kept
+    for group in _MD_EMPHASIS_GROUPS:
+        inner = match.group(group)
+        if inner is not None:
+            # Emphasis may be nested, e.g. a link or code inside bold text.
+            return _MD_STRIP_RE.sub(_strip_markdown_match, inner)
+    return " "
+
+
+@lru_cache(maxsize=65536)
 def clean_text(text: str) -> str:
     """Cleans the input text by removing markdown, mentions, emojis, and extra whitespace."""
     if not text:
         return ""
 
-    html = markdown.markdown(text)
-    soup = BeautifulSoup(html, "html.parser")
-    plain_text = soup.get_text(separator=" ")
-    plain_text = re.sub(r"@[a-zA-Z0-9_.]+", "", plain_text)
-    plain_text = re.sub(r"[😀-🙏🌀-🗿🚀-🛿🇠-🇿🤀-🧿☀-➿]+", "", plain_text)
-    plain_text = re.sub(r"\s+", " ", plain_text).strip()
+    if _MD_MARKERS.isdisjoint(text):
+        plain_text = text
+    else:
+        plain_text = _MD_STRIP_RE.sub(_strip_markdown_match, text)
+    plain_text = _MENTION_RE.sub("", plain_text)
+    # ASCII text cannot contain emoji, which spares the scan for most messages.
+    if not plain_text.isascii():
+        plain_text = _EMOJI_RE.sub("", plain_text)
+    plain_text = " ".join(plain_text.split())
 
     return plain_text
 
 
+@lru_cache(maxsize=8192)
+def _format_minute_msk(epoch_minute: int) -> str:
+    # Output has minute precision, so posts from the same minute share one result.
+    return format_dt_human_msk(epoch_ms_to_moscow_dt(epoch_minute * 60_000))
+
+
 def process_mattermost_posts(db: Session) -> None:
     """Entrypoint wrapper for class-based Mattermost processing."""
     setup_logging()
     processor = MattermostProcessor(db, logger=logging.getLogger(__name__))
-    processor.run()
+    try:
+        processor.run()
+    finally:
+        clean_text.cache_clear()
+        _format_minute_msk.cache_clear()
 
 
 class MattermostProcessor(BaseProcessor):
@@ -61,6 +151,7 @@ class MattermostProcessor(BaseProcessor):
         self.db = db
 
     def run(self) -> None:
+        settings = get_settings()
         repo = PostRepository(self.db)
 
         gdrive_service = get_gdrive_service()
@@ -109,14 +200,16 @@ class MattermostProcessor(BaseProcessor):
         )
 
         current_date = start_date
+        # Each period starts where the previous one ended, so its bound is reused.
+        current_ts = int(
+            current_date.astimezone(datetime.timezone.utc).timestamp() * 1000
+        )
         while current_date <= end_date:
             period_start_dt = current_date
             period_end_dt = period_start_dt + datetime.timedelta(
                 days=PROCESSING_CHUNK_DAYS
             )
-            period_start_ts = int(
-                period_start_dt.astimezone(datetime.timezone.utc).timestamp() * 1000
-            )
+            period_start_ts = current_ts
             period_end_ts = int(
                 period_end_dt.astimezone(datetime.timezone.utc).timestamp() * 1000
             )
@@ -125,106 +218,109 @@ class MattermostProcessor(BaseProcessor):
                 f"Processing period: {period_start_dt.strftime('%Y-%m-%d')} - {period_end_dt.strftime('%Y-%m-%d')}"
             )
 
-            for channel_id, channel_name in channel_map.items():
-                self.logger.info(f"Processing channel: {channel_name}")
-
-                root_posts_in_period: list[Post] = repo.get_root_posts_in_date_range(
-                    period_start_ts, period_end_ts, channel_id
-                )
-
-                if not root_posts_in_period:
-                    self.logger.info(
-                        f"No root posts found for channel {channel_name} in this period. Skipping."
+            with ThreadPoolExecutor(max_workers=MATTERMOST_CHANNEL_WORKERS) as executor:
+                futures = [
+                    executor.submit(
+                        self._process_channel,
+                        channel_id,
+                        channel_name,
+                        period_start_dt,
+                        period_end_dt,
+                        period_start_ts,
+                        period_end_ts,
                     )
-                    continue
-
-                root_post_ids = [post.Id for post in root_posts_in_period]
-                all_relevant_posts: list[Post] = repo.get_posts_by_ids_or_root_ids(
-                    root_post_ids
-                )
-
-                user_ids = {post.UserId for post in all_relevant_posts}
-                users = repo.get_users_by_ids(list(user_ids))
-                user_map = {user.Id: user.Username for user in users}
-
-                threads: dict[str, list[Post]] = {
-                    root_id: [] for root_id in root_post_ids
-                }
-                for post in all_relevant_posts:
-                    if post.RootId and post.RootId in threads:
-                        threads[post.RootId].append(post)
-                    elif post.Id in threads:
-                        threads[post.Id].insert(0, post)
+                    for channel_id, channel_name in channel_map.items()
+                ]
+                generated_files = [future.result() for future in futures]
+
+            upload_files_to_gdrive(
+                gdrive_service,
+                [file_path for file_path in generated_files if file_path is not None],
+                gdrive_folder_id,
+                as_gdoc=True,
+            )
 
-                chunk_content: list[str] = []
-                processed_threads_ids: set[str] = set()
+            current_date = period_end_dt
+            current_ts = period_end_ts
+
+    def _process_channel(
+        self,
+        channel_id: str,
+        channel_name: str,
+        period_start_dt: datetime.datetime,
+        period_end_dt: datetime.datetime,
+        period_start_ts: int,
+        period_end_ts: int,
+    ) -> Path | None:
+        """Build one channel's knowledge file for a period and return its path.
+
+        Runs in a worker thread, so it uses its own database session.
+        """
+        settings = get_settings()
+        self.logger.info(f"Processing channel: {channel_name}")
+        db = SessionLocal()
+        try:
+            repo = PostRepository(db)
+
+            thread_posts = repo.get_thread_posts_in_date_range(
+                period_start_ts, period_end_ts, channel_id
+            )
 
-                for root_post in root_posts_in_period:
-                    if root_post.Id in processed_threads_ids:
-                        continue
+            first_post = next(thread_posts, None)
+            if first_post is None:
+                self.logger.info(
+                    f"No root posts found for channel {channel_name} in this period. Skipping."
+                )
+                return None
 
-                    thread_posts_list = threads.get(root_post.Id, [])
-                    thread_posts_list.sort(key=lambda p: p.CreateAt)
+            start_ymd = format_date_ymd_msk(period_start_dt)
+            end_ymd = format_date_ymd_msk(period_end_dt)
+            metadata = MATTERMOST_METADATA_TEMPLATE.format(
+                channel=channel_name, start=start_ymd, end=end_ymd
+            )
 
-                    for post in thread_posts_list:
+            safe_channel = _SAFE_NAME_RE.sub("_", channel_name).replace(" ", "_")
+            file_name = f"mattermost__{safe_channel}__{start_ymd}__{end_ymd}.txt"
+            file_path = settings.mattermost_temp_dir / file_name
+
+            # Lines are streamed straight into the buffered file instead of being
+            # collected and joined in memory first.
+            lines_written = 0
+            separator = ""
+            try:
+                with open(
+                    file_path,
+                    "w",
+                    encoding="utf-8",
+                    buffering=FILE_WRITE_BUFFER_SIZE,
+                ) as f:
+                    f.write(metadata)
+                    for post in chain((first_post,), thread_posts):
                         if post.Message:
                             cleaned_message = clean_text(post.Message)
-                            username = user_map.get(post.UserId, f"user_{post.UserId}")
                             if cleaned_message:
-                                ts_msk = format_dt_human_msk(
-                                    epoch_ms_to_moscow_dt(post.CreateAt)
-                                )
-                                chunk_content.append(
-                                    f"datetime: {ts_msk}, user: {username}, message: {cleaned_message}"
+                                username = post.Username or f"user_{post.UserId}"
+                                ts_msk = _format_minute_msk(post.CreateAt // 60_000)
+                                f.write(
+                                    f"{separator}datetime: {ts_msk}, user: {username}, message: {cleaned_message}"
                                 )
-
-                    processed_threads_ids.add(root_post.Id)
-
-                if not chunk_content:
-                    self.logger.info(
-                        f"No content generated for channel {channel_name} in this period. Skipping."
-                    )
-                    continue
-
-                metadata = (
-                    "---\n"
-                    "source: Mattermost\n"
-                    f"channel: {channel_name}\n"
-                    "tz: Europe/Moscow\n"
-                    "date_range:\n"
-                    f"  start: {format_date_ymd_msk(period_start_dt)}\n"
-                    f"  end: {format_date_ymd_msk(period_end_dt)}\n"
-                    "body_format: kv-lines\n"
-                    "body_format_fields:\n"
-                    "  datetime: Message date and time (MSK)\n"
-                    "  user: Mattermost username\n"
-                    "  message: Message text (cleaned)\n"
-                    "---\n\n"
-                )
-
-                safe_channel = re.sub(r"[^\w\-_. ]+", "_", channel_name).replace(
-                    " ", "_"
+                                separator = "\n"
+                                lines_written += 1
+            except IOError as e:
+                self.logger.error(f"Error writing to file {file_path}: {e}")
+                return None
+
+            if not lines_written:
+                file_path.unlink(missing_ok=True)
+                self.logger.info(
+                    f"No content generated for channel {channel_name} in this period. Skipping."
                 )
-                file_name = f"mattermost__{safe_channel}__{format_date_ymd_msk(period_start_dt)}__{format_date_ymd_msk(period_end_dt)}.txt"
-                file_path = settings.mattermost_temp_dir / file_name
-
-                try:
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(metadata)
-                        f.write("\n".join(chunk_content))
-                    self.logger.info(f"Generated file: {file_path}")
-
-                    self.logger.info(
-                        f"Uploading {file_path.name} to Google Drive as a Google Doc..."
-                    )
-                    upload_file_to_gdrive(
-                        gdrive_service, file_path, gdrive_folder_id, as_gdoc=True
-                    )
-
-                except IOError as e:
-                    self.logger.error(f"Error writing to file {file_path}: {e}")
+                return None
 
-            current_date += datetime.timedelta(days=PROCESSING_CHUNK_DAYS)
+            self.logger.info(f"Generated file: {file_path}")
+            return file_path
+        finally:
+            db.close()
 
 
 if __name__ == "__main__":
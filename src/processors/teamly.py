@@ -1,74 +1,114 @@
+import base64
+import binascii
 import json
 import logging
 import re
 import shutil
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from pathlib import Path
 from typing import Any
 
 import requests
 from docx import Document
-
-from src.config import settings
-from src.constants import TEAMLY_EXCLUDED_ARTICLE_IDS
+from pydantic import TypeAdapter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import get_settings
+from src.constants import (
+    TEAMLY_DETAIL_WORKERS,
+    TEAMLY_EXCLUDED_ARTICLE_IDS,
+    TEAMLY_REQUEST_INTERVAL,
+)
 from src.logging_config import setup_logging
 from src.processors.base import BaseProcessor
 from src.schemas import TeamlyArticle
 from src.utils.gdrive_utils import (
     get_gdrive_service,
-    upload_file_to_gdrive,
+    upload_files_to_gdrive,
     delete_files_in_folder,
 )
 
+# Emoji and pictographs stripped from article text. The emoji blocks listed before
+# overlap and merge into everything from U+24C2 up, plus the zero-width joiner and
+# the watch, eject and fast-forward symbols.
+_EMOJI_RE = re.compile("[\u200d\u231a\u23cf\u23e9\u24c2-\U0010ffff]+")
+# Keys of editor content nodes that hold child nodes, in document order.
+_EDITOR_CHILD_KEYS = ("content", "children", "items", "paragraphs")
+# Runs of characters not allowed in generated file names.
+_SAFE_NAME_RE = re.compile(r"[^\w\-_. ]+")
+# Validates a whole page of tree items in a single pydantic-core call.
+_ARTICLE_LIST_ADAPTER = TypeAdapter(list[TeamlyArticle])
+# Access tokens expiring within this many seconds are refreshed before use.
+TOKEN_REFRESH_MARGIN_SECONDS = 30
+
 
 def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    emoji_pattern = re.compile(
-        "["
-        "\U0001f600-\U0001f64f"
-        "\U0001f300-\U0001f5ff"
-        "\U0001f680-\U0001f6ff"
-        "\U0001f1e0-\U0001f1ff"
-        "\U00002500-\U00002bef"
-        "\U00002702-\U000027b0"
-        "\U00002702-\U000027b0"
-        "\U000024c2-\U0001f251"
-        "\U0001f926-\U0001f937"
-        "\U00010000-\U0010ffff"
-        "\u2640-\u2642"
-        "\u2600-\u2b55"
-        "\u200d"
-        "\u23cf"
-        "\u23e9"
-        "\u231a"
-        "\ufe0f"
-        "\u3030"
-        "]+",
-        flags=re.UNICODE,
-    )
-    text = emoji_pattern.sub(r"", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    return text
+    # Every stripped code point is outside ASCII, so ASCII text skips the scan.
+    if not text.isascii():
+        text = _EMOJI_RE.sub("", text)
+    return " ".join(text.split())
+
+
+TEAMLY_METADATA_TEMPLATE = (
+    "---\n"
+    "source: Teamly\n"
+    "folder: {folder}\n"
+    "tz: Europe/Moscow\n"
+    "body_format: kv-blocks\n"
+    "---\n\n"
+)
+
+
+def _render_combined_txt(folder_name: str, chunks: list[tuple[str, str]]) -> bytes:
+    """Encode a combined group file in one go, ready to be written in binary mode."""
+    parts = [TEAMLY_METADATA_TEMPLATE.format(folder=folder_name)]
+    for title, content_str in chunks:
+        parts.append(f"# {title}\n")
+        parts.append(content_str.rstrip("\n") + "\n\n")
+    return "".join(parts).encode("utf-8")
+
+
+def _jwt_expiry(token: str | None) -> float | None:
+    """Return the `exp` claim of a JWT access token, or None if it has none."""
+    if not token:
+        return None
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (binascii.Error, ValueError, AttributeError):
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
 
 
 def process_teamly_documents() -> None:
     """Entrypoint wrapper for class-based Teamly processing."""
     setup_logging()
     processor = TeamlyProcessor(logger=logging.getLogger(__name__))
-    processor.run()
+    try:
+        processor.run()
+    finally:
+        processor.close()
 
 
 class TeamlyProcessor(BaseProcessor):
-    TEAMLY_SLUG = settings.teamly_api_slug
-
     def __init__(
         self, logger: logging.Logger | None = None, use_cached_local_files: bool = False
     ) -> None:
         super().__init__(logger)
+        settings = get_settings()
+        self.teamly_slug = settings.teamly_api_slug
+        self._space_id = settings.teamly_space_id
         # Token storage paths in secrets dir
         self._access_token_path: Path = settings.secrets_dir / "teamly_access_token.txt"
         self._refresh_token_path: Path = (
@@ -79,6 +119,7 @@ class TeamlyProcessor(BaseProcessor):
         access_from_file = self._read_token_from_file(self._access_token_path)
         refresh_from_file = self._read_token_from_file(self._refresh_token_path)
         self._access_token = access_from_file
+        self._token_expiry = _jwt_expiry(self._access_token)
         self._refresh_token = refresh_from_file
         if not self._access_token or not self._refresh_token:
             self.logger.error(
@@ -93,47 +134,72 @@ class TeamlyProcessor(BaseProcessor):
         self._tokens_ready = bool(self._access_token and self._refresh_token)
         self._client_id = settings.teamly_api_client_id
         self._client_secret = settings.teamly_api_client_secret
-        self._excluded_article_ids = TEAMLY_EXCLUDED_ARTICLE_IDS
+        self._excluded_article_ids: frozenset[str] = frozenset(
+            map(str, TEAMLY_EXCLUDED_ARTICLE_IDS)
+        )
         self._use_cached_local_files = use_cached_local_files
 
         self.authorize_endpoint = (
-            f"https://{self.TEAMLY_SLUG}.teamly.ru/api/v1/auth/integration/authorize"
+            f"https://{self.teamly_slug}.teamly.ru/api/v1/auth/integration/authorize"
         )
         self.refresh_token_endpoint = (
-            f"https://{self.TEAMLY_SLUG}.teamly.ru/api/v1/auth/integration/refresh"
+            f"https://{self.teamly_slug}.teamly.ru/api/v1/auth/integration/refresh"
         )
-        self.articles_endpoint = f"https://{self.TEAMLY_SLUG}.teamly.ru/api/v1/integrations/space/{settings.teamly_space_id}/tree"
+        self.articles_endpoint = f"https://{self.teamly_slug}.teamly.ru/api/v1/integrations/space/{self._space_id}/tree"
         self.article_detail_endpoint = (
-            f"https://{self.TEAMLY_SLUG}.teamly.ru/api/v1/wiki/ql/article"
+            f"https://{self.teamly_slug}.teamly.ru/api/v1/wiki/ql/article"
         )
 
-    @property
-    def headers(self) -> dict[str, str]:
-        return {
+        # One keep-alive session for all Teamly calls, so the TLS handshake is not
+        # repeated for every article; idempotent requests are retried on gateway errors.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[502, 503, 504],
+                    # Hand the last response back so callers report it as before.
+                    raise_on_status=False,
+                ),
+            ),
+        )
+
+        self._refresh_lock = threading.Lock()
+        # Earliest time the next API call may start, see _throttle().
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # Built once and kept in sync with the access token by _update_tokens_from_response.
+        self._base_headers = {
             "Content-Type": "application/json",
-            "X-Account-Slug": self.TEAMLY_SLUG,
+            "X-Account-Slug": self.teamly_slug,
             "Authorization": f"Bearer {self._access_token}",
         }
 
-    def _persist_env_value(self, key: str, value: str) -> None:
-        env_path: Path = settings.env_file
+    def close(self) -> None:
+        self._session.close()
+
+    def _persist_env_values(self, values: dict[str, str]) -> None:
+        """Set several keys in the .env file with a single read and write."""
+        env_path: Path = get_settings().env_file
         try:
-            if not env_path.exists():
-                env_path.write_text(f"{key}={value}\n", encoding="utf-8")
-                return
-            content = env_path.read_text(encoding="utf-8")
-            lines = content.splitlines()
-            updated = False
+            lines = (
+                env_path.read_text(encoding="utf-8").splitlines()
+                if env_path.exists()
+                else []
+            )
+            pending = dict(values)
             for idx, line in enumerate(lines):
-                if line.strip().startswith(f"{key}="):
-                    lines[idx] = f"{key}={value}"
-                    updated = True
-                    break
-            if not updated:
-                lines.append(f"{key}={value}")
+                key, sep, _ = line.strip().partition("=")
+                if sep and key in pending:
+                    lines[idx] = f"{key}={pending.pop(key)}"
+            lines.extend(f"{key}={value}" for key, value in pending.items())
             env_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
         except Exception as exc:
-            self.logger.warning(f"Failed to persist {key} to .env: {exc}")
+            self.logger.warning(f"Failed to persist {', '.join(values)} to .env: {exc}")
 
     def _read_token_from_file(self, path: Path) -> str | None:
         try:
@@ -160,6 +226,8 @@ class TeamlyProcessor(BaseProcessor):
             return False
 
         self._access_token = access
+        self._token_expiry = _jwt_expiry(access)
+        self._base_headers["Authorization"] = f"Bearer {access}"
         if refresh:
             self._refresh_token = refresh
 
@@ -168,17 +236,18 @@ class TeamlyProcessor(BaseProcessor):
         if refresh:
             self._write_token_to_file(self._refresh_token_path, self._refresh_token)
 
-        self._persist_env_value("TEAMLY_API_ACCESS_TOKEN", self._access_token)
+        env_values = {"TEAMLY_API_ACCESS_TOKEN": self._access_token}
         if refresh:
-            self._persist_env_value("TEAMLY_API_REFRESH_TOKEN", self._refresh_token)
+            env_values["TEAMLY_API_REFRESH_TOKEN"] = self._refresh_token
+        self._persist_env_values(env_values)
         return True
 
     def refresh_token(self) -> dict[str, Any] | None:
         headers = {
             "Content-Type": "application/json",
-            "X-Account-Slug": self.TEAMLY_SLUG,
+            "X-Account-Slug": self.teamly_slug,
         }
-        response = requests.post(
+        response = self._session.post(
             url=self.refresh_token_endpoint,
             json={
                 "client_id": self._client_id,
@@ -200,24 +269,67 @@ class TeamlyProcessor(BaseProcessor):
         self.logger.info("Teamly tokens refreshed and persisted.")
         return response_json
 
+    def _throttle(self) -> None:
+        """Wait until the next Teamly call is allowed by the client-wide rate limit.
+
+        Each caller reserves the next slot under the lock and sleeps outside it, so
+        concurrent workers together stay at TEAMLY_REQUEST_INTERVAL between calls.
+        """
+        with self._throttle_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + TEAMLY_REQUEST_INTERVAL
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def _merge_headers(self, headers: dict[str, str] | None) -> dict[str, str]:
+        if not headers:
+            return self._base_headers
+        return {**self._base_headers, **headers}
+
+    def _token_expiring(self) -> bool:
+        return (
+            self._token_expiry is not None
+            and time.time() > self._token_expiry - TOKEN_REFRESH_MARGIN_SECONDS
+        )
+
     def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
-        headers = kwargs.pop("headers", {}) or {}
-        merged_headers = {**self.headers, **headers}
+        headers = kwargs.pop("headers", None)
         timeout = kwargs.pop("timeout", 30)
-
-        response = requests.request(
-            method=method, url=url, headers=merged_headers, timeout=timeout, **kwargs
+        if self._token_expiring():
+            with self._refresh_lock:
+                # Another request may have refreshed it while this one waited.
+                if self._token_expiring() and self.refresh_token() is None:
+                    # Leave it to the 401 handling below instead of retrying each call.
+                    self._token_expiry = None
+        token_used = self._access_token
+
+        response = self._session.request(
+            method=method,
+            url=url,
+            headers=self._merge_headers(headers),
+            timeout=timeout,
+            **kwargs,
+        )
+        # A 403 with a token known to be valid is a genuine permission error.
+        auth_failed = response.status_code == HTTPStatus.UNAUTHORIZED or (
+            response.status_code == HTTPStatus.FORBIDDEN and self._token_expiry is None
         )
-        if response.status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+        if auth_failed:
             self.logger.info(
                 "Access token likely expired. Attempting to refresh and retry..."
             )
-            if self.refresh_token() is not None:
-                merged_headers = {**self.headers, **headers}
-                response = requests.request(
+            # Requests run concurrently; only one of them refreshes the token, the
+            # others retry with the token it obtained.
+            with self._refresh_lock:
+                refreshed = (
+                    self._access_token != token_used or self.refresh_token() is not None
+                )
+            if refreshed:
+                response = self._session.request(
                     method=method,
                     url=url,
-                    headers=merged_headers,
+                    headers=self._merge_headers(headers),
                     timeout=timeout,
                     **kwargs,
                 )
@@ -226,9 +338,9 @@ class TeamlyProcessor(BaseProcessor):
     def list_articles_page(
         self, page: int = 1
     ) -> tuple[list[TeamlyArticle], dict[str, Any]]:
-        time.sleep(0.2)
+        self._throttle()
         self.logger.info(
-            f"Fetching Teamly articles page={page} for space {settings.teamly_space_id}"
+            f"Fetching Teamly articles page={page} for space {self._space_id}"
         )
         response = self._request(
             "GET",
@@ -245,34 +357,38 @@ class TeamlyProcessor(BaseProcessor):
         data = response.json() or {}
         items = data.get("items") or []
         pagination = data.get("pagination") or {}
-        excluded = set(self._excluded_article_ids)
+        excluded = self._excluded_article_ids
         if excluded:
             before = len(items)
-            items = [it for it in items if str(it.get("id")) not in excluded]
+            # Ids are strings in the API response (TeamlyArticle.id is a str).
+            items = [it for it in items if it.get("id") not in excluded]
             removed = before - len(items)
             if removed:
                 self.logger.info(f"Excluded {removed} items on page {page}")
-        parsed = [TeamlyArticle.model_validate(obj) for obj in items]
+        parsed = _ARTICLE_LIST_ADAPTER.validate_python(items)
         self.logger.info(
             f"Fetched {len(parsed)} items on page {pagination.get('currentPage', page)} / {pagination.get('lastPage', '?')}"
         )
         return parsed, pagination
 
     def list_all_articles(self) -> list[TeamlyArticle]:
-        page = 1
-        all_items: list[TeamlyArticle] = []
-        last_page: int | None = None
-        while last_page is None or page <= last_page:
-            items, pagination = self.list_articles_page(page=page)
-            all_items.extend(items)
-            current = int(pagination.get("currentPage", page) or page)
-            last_page = int(pagination.get("lastPage", current) or current)
-            self.logger.info(
-                f"Accumulated articles: {len(all_items)} after page {current} of {last_page}"
-            )
-            if page >= last_page:
-                break
-            page += 1
+        items, pagination = self.list_articles_page(page=1)
+        all_items: list[TeamlyArticle] = list(items)
+        current = int(pagination.get("currentPage", 1) or 1)
+        last_page = int(pagination.get("lastPage", current) or current)
+        self.logger.info(
+            f"Accumulated articles: {len(all_items)} after page {current} of {last_page}"
+        )
+        if last_page > 1:
+            # The next page is already requested while the current one is consumed.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                pages = executor.map(self.list_articles_page, range(2, last_page + 1))
+                for page, (items, pagination) in enumerate(pages, start=2):
+                    all_items.extend(items)
+                    current = int(pagination.get("currentPage", page) or page)
+                    self.logger.info(
+                        f"Accumulated articles: {len(all_items)} after page {current} of {last_page}"
+                    )
         self.logger.info(f"Total articles collected: {len(all_items)}")
         return all_items
 
@@ -286,30 +402,33 @@ class TeamlyProcessor(BaseProcessor):
                 return ""
 
             parts: list[str] = []
-
-            def visit(node: Any) -> None:
+            # Depth-first walk with an explicit stack; children are pushed in reverse
+            # so text is still collected in document order.
+            stack: list[Any] = [obj]
+            while stack:
+                node = stack.pop()
                 if isinstance(node, dict):
                     text_val = node.get("text")
                     if isinstance(text_val, str):
-                        parts.append(text_val)
-                    for key in ("content", "children", "items", "paragraphs"):
+                        text_val = text_val.strip()
+                        if text_val:
+                            parts.append(text_val)
+                    for key in reversed(_EDITOR_CHILD_KEYS):
                         child = node.get(key)
                         if isinstance(child, list):
-                            for c in child:
-                                visit(c)
+                            stack.extend(reversed(child))
                 elif isinstance(node, list):
-                    for item in node:
-                        visit(item)
+                    stack.extend(reversed(node))
 
-            visit(obj)
-            combined = "\n".join(s for s in (p.strip() for p in parts) if s)
-            return clean_text(combined)
+            if not parts:
+                return ""
+            return clean_text("\n".join(parts))
         except Exception as exc:
             self.logger.warning(f"Failed to parse editor content: {exc}")
             return ""
 
     def get_article_details(self, article_id: str) -> dict[str, Any]:
-        time.sleep(0.2)
+        self._throttle()
         payload = {
             "query": {
                 "__filter": {"id": article_id},
@@ -321,7 +440,7 @@ class TeamlyProcessor(BaseProcessor):
                 "relatedParentId": True,
             }
         }
-        self.logger.info(f"Fetching Teamly article details for id={article_id}")
+        self.logger.debug(f"Fetching Teamly article details for id={article_id}")
         try:
             response = self._request("POST", self.article_detail_endpoint, json=payload)
             response.raise_for_status()
@@ -346,19 +465,28 @@ class TeamlyProcessor(BaseProcessor):
             )
             raise
         data = response.json() or {}
-        self.logger.info(f"Fetched details for id={article_id}")
+        self.logger.debug(f"Fetched details for id={article_id}")
         return data
 
+    def get_many_article_details(
+        self, article_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch details of several articles concurrently, keyed by article id."""
+        with ThreadPoolExecutor(max_workers=TEAMLY_DETAIL_WORKERS) as executor:
+            return dict(
+                zip(article_ids, executor.map(self.get_article_details, article_ids))
+            )
+
     def get_article_clean_text(self, article_id: str) -> str:
         data = self.get_article_details(article_id)
         editor_obj = (data or {}).get("editorContentObject") or {}
         content_field = editor_obj.get("content")
-        text = self._extract_text_from_editor_content(content_field)
-        if not text:
+        # Editor content comes back cleaned already; only the title fallback is not.
+        cleaned = self._extract_text_from_editor_content(content_field)
+        if not cleaned:
             latest = (data or {}).get("latestProperties") or {}
             title = ((latest.get("title") or {}).get("text")) or data.get("title")
-            text = title or ""
-        cleaned = clean_text(text)
+            cleaned = clean_text(title or "")
         self.logger.info(
             f"Produced cleaned text for id={article_id}, length={len(cleaned)} chars"
         )
@@ -367,12 +495,13 @@ class TeamlyProcessor(BaseProcessor):
     def get_article_clean_text_from_data(self, data: dict[str, Any]) -> str:
         editor_obj = (data or {}).get("editorContentObject") or {}
         content_field = editor_obj.get("content")
+        # Editor content comes back cleaned already; only the title fallback is not.
         text = self._extract_text_from_editor_content(content_field)
         if not text:
             latest = (data or {}).get("latestProperties") or {}
             title = ((latest.get("title") or {}).get("text")) or data.get("title")
-            text = title or ""
-        return clean_text(text)
+            text = clean_text(title or "")
+        return text
 
     def _title_from_details(self, data: dict[str, Any]) -> str:
         latest = (data or {}).get("latestProperties") or {}
@@ -418,7 +547,7 @@ class TeamlyProcessor(BaseProcessor):
         return ancestors
 
     def _is_excluded_or_descendant(self, article_id: str, data: dict[str, Any]) -> bool:
-        excluded = set(self._excluded_article_ids)
+        excluded = self._excluded_article_ids
         if article_id in excluded:
             return True
         for anc_id in self._ancestor_ids_from_details(data):
@@ -437,6 +566,7 @@ class TeamlyProcessor(BaseProcessor):
         if not service:
             self.logger.error("Could not get Google Drive service. Aborting.")
             return
+        settings = get_settings()
         processed_folder_id = settings.google_drive_teamly_processed_dir_id
         temp_dir = settings.teamly_temp_dir
         temp_dir.mkdir(parents=True, exist_ok=True)
@@ -473,12 +603,17 @@ class TeamlyProcessor(BaseProcessor):
         combined_txt_paths: list[Path] = []
 
         if not self._use_cached_local_files:
+            # Requests overlap their network latency in parallel; _throttle() still
+            # keeps the whole client at the Teamly rate limit.
+            fetched_details = self.get_many_article_details(
+                [art.id for art in articles]
+            )
             total = len(articles)
             for idx, art in enumerate(articles, start=1):
                 self.logger.info(
                     f"Details progress {idx}/{total} ({(idx / total) * 100:.1f}%) id={art.id}"
                 )
-                data = self.get_article_details(art.id)
+                data = fetched_details[art.id]
                 if not data:
                     continue
                 # Skip any article that is excluded explicitly or is a descendant of an excluded node
@@ -503,7 +638,9 @@ class TeamlyProcessor(BaseProcessor):
                             )
                         else:
                             try:
-                                top2 = self.get_article_details(second_id)
+                                top2 = fetched_details.get(
+                                    second_id
+                                ) or self.get_article_details(second_id)
                                 if top2:
                                     details_cache[second_id] = top2
                                     group_titles[second_id] = self._title_from_details(
@@ -540,9 +677,9 @@ class TeamlyProcessor(BaseProcessor):
                 body = text
                 if text.startswith("---\n") and end != -1:
                     body = text[end + len("\n---\n") :]
-                lines = body.splitlines()
-                if lines and lines[0].startswith("# "):
-                    body = "\n".join(lines[1:])
+                if body.startswith("# "):
+                    # Only the heading line is cut; the rest is kept as one slice.
+                    body = body.partition("\n")[2]
                 groups.setdefault(folder, []).append((title, body))
 
         if not self._use_cached_local_files:
@@ -571,21 +708,12 @@ class TeamlyProcessor(BaseProcessor):
                 if not combined_chunks:
                     continue
                 folder_name = group_titles.get(second_id) or second_id
-                safe_folder_name = re.sub(r"[^\w\-_. ]+", "_", folder_name).replace(
-                    " ", "_"
-                )
+                safe_folder_name = _SAFE_NAME_RE.sub("_", folder_name).replace(" ", "_")
                 combined_txt = temp_dir / f"teamly__{safe_folder_name}.txt"
                 try:
-                    with open(combined_txt, "w", encoding="utf-8") as f:
-                        f.write("---\n")
-                        f.write("source: Teamly\n")
-                        f.write(f"folder: {folder_name}\n")
-                        f.write("tz: Europe/Moscow\n")
-                        f.write("body_format: kv-blocks\n")
-                        f.write("---\n\n")
-                        for title, content_str in combined_chunks:
-                            f.write(f"# {title}\n")
-                            f.write(content_str.rstrip("\n") + "\n\n")
+                    combined_txt.write_bytes(
+                        _render_combined_txt(folder_name, combined_chunks)
+                    )
                     combined_txt_paths.append(combined_txt)
                     self.logger.info(
                         f"Generated combined TXT for '{folder_name}': {combined_txt}"
@@ -603,21 +731,12 @@ class TeamlyProcessor(BaseProcessor):
                 ]
                 if not combined_chunks:
                     continue
-                safe_folder_name = re.sub(r"[^\w\-_. ]+", "_", folder_name).replace(
-                    " ", "_"
-                )
+                safe_folder_name = _SAFE_NAME_RE.sub("_", folder_name).replace(" ", "_")
                 combined_txt = temp_dir / f"teamly__{safe_folder_name}.txt"
                 try:
-                    with open(combined_txt, "w", encoding="utf-8") as f:
-                        f.write("---\n")
-                        f.write("source: Teamly\n")
-                        f.write(f"folder: {folder_name}\n")
-                        f.write("tz: Europe/Moscow\n")
-                        f.write("body_format: kv-blocks\n")
-                        f.write("---\n\n")
-                        for title, content_str in combined_chunks:
-                            f.write(f"# {title}\n")
-                            f.write(content_str.rstrip("\n") + "\n\n")
+                    combined_txt.write_bytes(
+                        _render_combined_txt(folder_name, combined_chunks)
+                    )
                     combined_txt_paths.append(combined_txt)
                     self.logger.info(
                         f"Generated combined TXT for '{folder_name}': {combined_txt}"
@@ -633,7 +752,20 @@ class TeamlyProcessor(BaseProcessor):
             txt_targets = list(sorted(temp_dir.glob("*.txt")))
         else:
             txt_targets = combined_txt_paths
-        for txt_path in txt_targets:
+        # Each DOCX starts uploading as soon as it is converted, while the next
+        # one is built; uploads are network bound, so they also run concurrently.
+        upload_files_to_gdrive(
+            service,
+            self._convert_txt_to_docx(txt_targets, temp_dir),
+            processed_folder_id,
+            as_gdoc=True,
+        )
+
+    def _convert_txt_to_docx(
+        self, txt_paths: list[Path], temp_dir: Path
+    ) -> Iterator[Path]:
+        """Convert TXT files to DOCX one by one, yielding each converted path."""
+        for txt_path in txt_paths:
             try:
                 folder_name = txt_path.stem
                 docx_path = temp_dir / f"{folder_name}.docx"
@@ -646,16 +778,10 @@ class TeamlyProcessor(BaseProcessor):
                         doc.add_paragraph(line)
                 doc.save(docx_path)
                 self.logger.info(f"Converted TXT to DOCX: {docx_path}")
-                self.logger.info(
-                    f"Uploading {docx_path.stem} to Google Drive as a Google Doc..."
-                )
-                upload_file_to_gdrive(
-                    service, docx_path, processed_folder_id, as_gdoc=True
-                )
             except Exception as e:
-                self.logger.error(
-                    f"Failed converting/uploading {txt_path.name} to DOCX/GDoc: {e}"
-                )
+                self.logger.error(f"Failed converting {txt_path.name} to DOCX: {e}")
+                continue
+            yield docx_path
 
 
 if __name__ == "__main__":
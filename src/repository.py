@@ -1,10 +1,13 @@
-from datetime import datetime, timedelta
+import time
+from collections.abc import Collection, Iterator
 
-from sqlalchemy import func
+from sqlalchemy import Row, func, select, union_all
 from sqlalchemy.orm import Session
 
 from src.models import Post, Channel, User
 
+MS_PER_DAY = 86_400_000
+
 
 class PostRepository:
     def __init__(self, db: Session) -> None:
@@ -16,54 +19,66 @@ class PostRepository:
         if not max_ts:
             return None, None
 
-        start_dt = datetime.now() - timedelta(days=days_ago)
-        start_ts = int(start_dt.timestamp() * 1000)
+        now_ms = time.time_ns() // 1_000_000
+        start_ts = now_ms - days_ago * MS_PER_DAY
 
         return start_ts, max_ts
 
-    def get_root_posts_in_date_range(
+    def get_thread_posts_in_date_range(
         self, start_ts: int, end_ts: int, channel_id: str
-    ) -> list[Post]:
-        """Returns root posts within a given date range for a specific channel, ordered by creation time."""
-        return (
-            self.db.query(Post)
+    ) -> Iterator[Row]:
+        """
+        Yields every post of the threads started in a date range for a specific channel,
+        together with the author's username, in a single query.
+        Rows are ordered by root post creation time, then by creation time within each thread,
+        and are streamed from a server-side cursor in batches instead of being loaded at once.
+        Only the columns needed for output are selected, so no ORM instances are built.
+        """
+        roots = (
+            select(Post.Id.label("root_id"), Post.CreateAt.label("root_create_at"))
             .join(Channel, Post.ChannelId == Channel.Id)
-            .filter(
+            .where(
                 Post.CreateAt >= start_ts,
                 Post.CreateAt < end_ts,
                 Post.RootId == "",
                 Post.ChannelId == channel_id,
                 Channel.Type.in_(["O", "P"]),
             )
-            .order_by(Post.CreateAt)
-            .all()
+            .cte("roots")
         )
-
-    def get_posts_by_ids_or_root_ids(self, post_ids: list[str]) -> list[Post]:
-        """
-        Returns posts whose Id is in post_ids, or whose RootId is in post_ids.
-        This effectively fetches all posts belonging to the threads identified by post_ids.
-        """
-        if not post_ids:
-            return []
-        return (
-            self.db.query(Post)
-            .filter((Post.Id.in_(post_ids)) | (Post.RootId.in_(post_ids)))
-            .order_by(Post.CreateAt)
-            .all()
+        # Roots and replies are fetched by two separate joins, so each can use its
+        # own index (primary key, RootId) instead of one OR condition.
+        thread_columns = (
+            Post.Id,
+            Post.UserId,
+            Post.CreateAt,
+            Post.Message,
+            roots.c.root_id,
+            roots.c.root_create_at,
         )
+        thread_posts = union_all(
+            select(*thread_columns).join(roots, Post.Id == roots.c.root_id),
+            select(*thread_columns).join(roots, Post.RootId == roots.c.root_id),
+        ).subquery("thread_posts")
+        stmt = (
+            select(
+                thread_posts.c.Id,
+                thread_posts.c.UserId,
+                thread_posts.c.CreateAt,
+                thread_posts.c.Message,
+                User.Username,
+            )
+            .outerjoin(User, User.Id == thread_posts.c.UserId)
+            .order_by(
+                thread_posts.c.root_create_at,
+                thread_posts.c.root_id,
+                thread_posts.c.CreateAt,
+            )
+            .execution_options(yield_per=1000)
+        )
+        yield from self.db.execute(stmt)
 
-    def get_user_by_id(self, user_id: str) -> User | None:
-        """Returns a user by their ID."""
-        return self.db.query(User).filter(User.Id == user_id).first()
-
-    def get_users_by_ids(self, user_ids: list[str]) -> list[User]:
-        """Returns a list of users by their IDs."""
-        if not user_ids:
-            return []
-        return self.db.query(User).filter(User.Id.in_(user_ids)).all()
-
-    def get_channels_by_ids(self, channel_ids: list[str]) -> list[Channel]:
+    def get_channels_by_ids(self, channel_ids: Collection[str]) -> list[Channel]:
         """Returns a list of channels by their IDs."""
         if not channel_ids:
             return []
@@ -71,5 +86,5 @@ class PostRepository:
 
     def get_channel_name_by_id(self, channel_id: str) -> str | None:
         """Returns a channel's name by its ID."""
-        channel = self.db.query(Channel).filter(Channel.Id == channel_id).first()
+        channel = self.db.get(Channel, channel_id)
         return channel.Name if channel else None
@@ -1,26 +1,59 @@
 import logging
+import threading
+from collections.abc import Iterable, Sized
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, BinaryIO
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 import time
 
-from src.config import settings
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/drive"]
+# Maximum number of calls Google accepts in a single batch request.
+DRIVE_BATCH_SIZE = 100
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+# Largest page size files.list accepts.
+DRIVE_LIST_PAGE_SIZE = 1000
+
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def _load_credentials(account_file: Path) -> Credentials:
+    return Credentials.from_service_account_file(account_file, scopes=SCOPES)
 
 
 def get_gdrive_service() -> Resource | None:
+    """Return the Drive service of the calling thread, building it on first use.
+
+    Drive services wrap a single httplib2 connection, which is not thread-safe, so
+    each thread (processor or upload worker) gets its own; the service account
+    credentials are loaded once and shared.
+    """
+    service = getattr(_thread_local, "gdrive_service", None)
+    if service is not None:
+        return service
+    settings = get_settings()
     try:
-        creds = Credentials.from_service_account_file(
-            settings.google_account_file, scopes=SCOPES
+        creds = _load_credentials(settings.google_account_file)
+        # The bundled discovery document is used, so building makes no HTTP call.
+        service = build(
+            "drive",
+            "v3",
+            credentials=creds,
+            static_discovery=True,
+            cache_discovery=False,
         )
-        service = build("drive", "v3", credentials=creds)
+        _thread_local.gdrive_service = service
         return service
     except FileNotFoundError:
         logger.error(
@@ -43,26 +76,63 @@ def _detect_mimetype(file_path: Path) -> str:
 
 
 def upload_file_to_gdrive(
-    service, file_path: Path, folder_id: str, as_gdoc: bool = False
+    service,
+    file_path: Path,
+    folder_id: str,
+    as_gdoc: bool = False,
+    chunksize: int = UPLOAD_CHUNK_SIZE,
 ):
     """Uploads a file to a specific folder in Google Drive, optionally as a Google Doc.
 
+    - Files larger than chunksize use a resumable upload sent in chunks of that size.
     - When as_gdoc is True, file is imported as Google Doc by setting target mimeType
       to application/vnd.google-apps.document while media mimetype reflects the source.
     - Includes simple retries for transient 5xx errors.
     """
-    file_name_display = file_path.stem if as_gdoc else file_path.name
+    # A file that fits in one chunk is sent in a single multipart request,
+    # which saves the extra round trip of opening a resumable session.
+    resumable = file_path.stat().st_size > chunksize
+    media = MediaFileUpload(
+        str(file_path),
+        mimetype=_detect_mimetype(file_path),
+        chunksize=chunksize,
+        resumable=resumable,
+    )
+    _create_drive_file(service, media, file_path, folder_id, as_gdoc)
+
+
+def upload_stream_to_gdrive(
+    service,
+    stream: BinaryIO,
+    file_name: str,
+    folder_id: str,
+    as_gdoc: bool = False,
+):
+    """Uploads the content of a binary stream, e.g. io.BytesIO, as file_name.
+
+    The content is sent in a single request without touching disk; conversion to
+    a Google Doc and retries behave as in upload_file_to_gdrive.
+    """
+    name_path = Path(file_name)
+    media = MediaIoBaseUpload(
+        stream, mimetype=_detect_mimetype(name_path), resumable=False
+    )
+    _create_drive_file(service, media, name_path, folder_id, as_gdoc)
+
+
+def _create_drive_file(
+    service, media, name_path: Path, folder_id: str, as_gdoc: bool
+) -> None:
+    """Creates the Drive file named after name_path with the given media body."""
+    file_name_display = name_path.stem if as_gdoc else name_path.name
     if as_gdoc:
         file_metadata = {
-            "name": file_path.stem,
+            "name": name_path.stem,
             "parents": [folder_id],
             "mimeType": "application/vnd.google-apps.document",
         }
     else:
-        file_metadata = {"name": file_path.name, "parents": [folder_id]}
-
-    media_mime = _detect_mimetype(file_path)
-    media = MediaFileUpload(str(file_path), mimetype=media_mime, resumable=True)
+        file_metadata = {"name": name_path.name, "parents": [folder_id]}
 
     max_attempts = 3
     delay = 2.0
@@ -94,11 +164,11 @@ def upload_file_to_gdrive(
             if status and int(status) == 413 and as_gdoc and not tried_binary_fallback:
                 logger.warning(
                     "Drive import too large for %s. Falling back to binary upload without conversion.",
-                    file_path.name,
+                    name_path.name,
                 )
                 as_gdoc = False
-                file_metadata = {"name": file_path.name, "parents": [folder_id]}
-                file_name_display = file_path.name
+                file_metadata = {"name": name_path.name, "parents": [folder_id]}
+                file_name_display = name_path.name
                 tried_binary_fallback = True
                 # retry immediately without backoff
                 continue
@@ -106,7 +176,7 @@ def upload_file_to_gdrive(
                 logger.warning(
                     "Transient Drive error (%s) uploading %s. Retrying in %.1fs (attempt %d/%d)",
                     status,
-                    file_path.name,
+                    name_path.name,
                     delay,
                     attempt,
                     max_attempts,
@@ -116,100 +186,196 @@ def upload_file_to_gdrive(
                 delay *= 2
                 continue
             logger.error(
-                "An error occurred while uploading %s: %s", file_path.name, error
+                "An error occurred while uploading %s: %s", name_path.name, error
             )
             return
         except Exception as e:
             logger.error(
                 "An unexpected error occurred during upload of %s: %s",
-                file_path.name,
+                name_path.name,
                 e,
             )
             return
 
 
+def upload_files_to_gdrive(
+    service,
+    files: Iterable[Path | tuple[BinaryIO, str]],
+    folder_id: str,
+    as_gdoc: bool = False,
+) -> None:
+    """Uploads several files to a folder in Google Drive.
+
+    - Items are either paths or (stream, file_name) pairs, see
+      upload_file_to_gdrive and upload_stream_to_gdrive.
+    - Up to GOOGLE_DRIVE_UPLOAD_CONCURRENCY uploads run at once; with a value of 1
+      files are uploaded one after another through the given service.
+    - files may be a lazy iterable, e.g. a generator producing them; each file then
+      starts uploading while the next one is being produced.
+    """
+
+    def upload(upload_service, item: Path | tuple[BinaryIO, str]) -> None:
+        if isinstance(item, tuple):
+            stream, file_name = item
+            logger.info(f"Uploading {file_name} to Google Drive...")
+            upload_stream_to_gdrive(
+                upload_service, stream, file_name, folder_id, as_gdoc=as_gdoc
+            )
+        else:
+            logger.info(f"Uploading {item.name} to Google Drive...")
+            upload_file_to_gdrive(upload_service, item, folder_id, as_gdoc=as_gdoc)
+
+    def upload_in_worker_thread(item: Path | tuple[BinaryIO, str]) -> None:
+        upload(get_gdrive_service(), item)
+
+    workers = get_settings().google_drive_upload_concurrency
+    if isinstance(files, Sized):
+        workers = min(workers, len(files))
+    if workers <= 1:
+        for item in files:
+            upload(service, item)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(upload_in_worker_thread, item) for item in files]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"An unexpected error occurred during upload: {e}")
+
+
+def _execute_in_batches(service, requests: list[tuple[str, Any]], callback) -> None:
+    """Executes (request_id, request) pairs as Drive batch requests.
+
+    callback is invoked per request as callback(request_id, response, exception).
+    """
+    for start in range(0, len(requests), DRIVE_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for request_id, request in requests[start : start + DRIVE_BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+
+
+def _format_owners(item: dict[str, Any]) -> str:
+    owners = item.get("owners", [])
+    return (
+        ", ".join(f"{o.get('displayName')}<{o.get('emailAddress')}>" for o in owners)
+        or "unknown"
+    )
+
+
 def delete_files_in_folder(service, folder_id: str):
     try:
         query = f"'{folder_id}' in parents and trashed=false"
-        results = (
-            service.files()
-            .list(
-                q=query,
-                fields=(
-                    "files("
-                    "id, name, mimeType, driveId, "
-                    "owners(displayName,emailAddress), "
-                    "capabilities(canTrash,canDelete)"
-                    ")"
-                ),
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True,
+        items: list[dict[str, Any]] = []
+        page_token: str | None = None
+        # Drive returns at most pageSize files per call, so follow every page.
+        while True:
+            results = (
+                service.files()
+                .list(
+                    q=query,
+                    fields=(
+                        "nextPageToken, files("
+                        "id, name, "
+                        "owners(displayName,emailAddress), "
+                        "capabilities(canTrash,canDelete)"
+                        ")"
+                    ),
+                    pageSize=DRIVE_LIST_PAGE_SIZE,
+                    pageToken=page_token,
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True,
+                )
+                .execute()
             )
-            .execute()
-        )
-        items = results.get("files", [])
+            items.extend(results.get("files", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
         if not items:
             logger.info(f"No files found in folder ID: {folder_id} to delete.")
             return
 
         logger.info(f"Found {len(items)} files to delete in folder ID: {folder_id}.")
+        items_by_id = {item.get("id"): item for item in items}
+        to_trash: list[dict[str, Any]] = []
+        to_delete: list[dict[str, Any]] = []
+
+        def warn_insufficient_permissions(item: dict[str, Any]) -> None:
+            logger.warning(
+                "Insufficient permissions to remove file %s (ID: %s). Owners: %s. "
+                "Required: canTrash or canDelete on this item or higher role on its drive (Content manager/Manager).",
+                item.get("name"),
+                item.get("id"),
+                _format_owners(item),
+            )
+
         for item in items:
-            file_id = item.get("id")
-            file_name = item.get("name")
             capabilities = item.get("capabilities", {})
-            can_trash = capabilities.get("canTrash", False)
-            can_delete = capabilities.get("canDelete", False)
+            # Prefer moving to trash to avoid hard-delete permission issues
+            if capabilities.get("canTrash", False):
+                to_trash.append(item)
+            elif capabilities.get("canDelete", False):
+                to_delete.append(item)
+            else:
+                warn_insufficient_permissions(item)
 
-            owners = item.get("owners", [])
-            owners_str = (
-                ", ".join(
-                    f"{o.get('displayName')}<{o.get('emailAddress')}>" for o in owners
+        def on_trashed(file_id: str, _response, error) -> None:
+            item = items_by_id[file_id]
+            if error is None:
+                logger.info(
+                    f"Trashed file: {item.get('name')} (ID: {file_id}) owned by {_format_owners(item)}"
                 )
-                or "unknown"
+                return
+            # Fall through to try hard delete if permitted
+            logger.warning(
+                f"Failed to trash file {item.get('name')} (ID: {file_id}): {error}"
             )
+            if item.get("capabilities", {}).get("canDelete", False):
+                to_delete.append(item)
+            else:
+                warn_insufficient_permissions(item)
 
-            # Prefer moving to trash to avoid hard-delete permission issues
-            if can_trash:
-                try:
+        def on_deleted(file_id: str, _response, error) -> None:
+            item = items_by_id[file_id]
+            if error is None:
+                logger.info(
+                    f"Permanently deleted file: {item.get('name')} (ID: {file_id}) owned by {_format_owners(item)}"
+                )
+            else:
+                logger.error(
+                    f"Failed to hard-delete file {item.get('name')} (ID: {file_id}): {error}"
+                )
+
+        # Each batch carries up to DRIVE_BATCH_SIZE calls in a single HTTP round trip.
+        _execute_in_batches(
+            service,
+            [
+                (
+                    item["id"],
                     service.files().update(
-                        fileId=file_id,
+                        fileId=item["id"],
                         body={"trashed": True},
                         supportsAllDrives=True,
-                    ).execute()
-                    logger.info(
-                        f"Trashed file: {file_name} (ID: {file_id}) owned by {owners_str}"
-                    )
-                    continue
-                except HttpError as error:
-                    # Fall through to try hard delete if permitted
-                    logger.warning(
-                        f"Failed to trash file {file_name} (ID: {file_id}): {error}"
-                    )
-
-            if can_delete:
-                try:
-                    service.files().delete(
-                        fileId=file_id,
-                        supportsAllDrives=True,
-                    ).execute()
-                    logger.info(
-                        f"Permanently deleted file: {file_name} (ID: {file_id}) owned by {owners_str}"
-                    )
-                    continue
-                except HttpError as error:
-                    logger.error(
-                        f"Failed to hard-delete file {file_name} (ID: {file_id}): {error}"
-                    )
-                    continue
-
-            # If neither action is permitted, provide a clear diagnostic
-            logger.warning(
-                "Insufficient permissions to remove file %s (ID: %s). Owners: %s. "
-                "Required: canTrash or canDelete on this item or higher role on its drive (Content manager/Manager).",
-                file_name,
-                file_id,
-                owners_str,
-            )
+                    ),
+                )
+                for item in to_trash
+            ],
+            on_trashed,
+        )
+        _execute_in_batches(
+            service,
+            [
+                (
+                    item["id"],
+                    service.files().delete(fileId=item["id"], supportsAllDrives=True),
+                )
+                for item in to_delete
+            ],
+            on_deleted,
+        )
     except HttpError as error:
         logger.error(
             f"An error occurred while listing files for deletion in folder {folder_id}: {error}"
@@ -6,7 +6,7 @@ from googleapiclient.discovery import build
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
-from src.config import settings
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +16,7 @@ SHEETS_SCOPES = [
 
 
 def get_gsheets_service() -> Optional[Resource]:
+    settings = get_settings()
     try:
         creds = Credentials.from_service_account_file(
             settings.google_account_file, scopes=SHEETS_SCOPES
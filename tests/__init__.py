@@ -0,0 +1,27 @@
+import os
+
+# Settings are read when the processor modules are imported (the database engine
+# is built at import time). Tests never reach the services, so placeholders are
+# enough and a local .env is not required; real environment variables still win.
+_TEST_SETTINGS = {
+    "GOOGLE_ACCOUNT_FILE_NAME": "service_account.json",
+    "GOOGLE_DRIVE_TEAMLY_SOURCE_DIR_ID": "test",
+    "GOOGLE_DRIVE_TEAMLY_PROCESSED_DIR_ID": "test",
+    "GOOGLE_DRIVE_MATTERMOST_PROCESSED_DIR_ID": "test",
+    "GOOGLE_DRIVE_HR_PROCESSED_DIR_ID": "test",
+    "GOOGLE_SHEETS_HR_SPREADSHEET_ID": "test",
+    "GOOGLE_SHEETS_HR_SHEET_NAME": "Sheet1",
+    "GOOGLE_SHEETS_HR_SHEET_GID": "0",
+    "GOOGLE_SHEETS_HR_RANGE": "A:AS",
+    "TEAMLY_SPACE_ID": "test",
+    "TEAMLY_API_SLUG": "test",
+    "TEAMLY_API_CLIENT_ID": "test",
+    "TEAMLY_API_CLIENT_SECRET": "test",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+}
+for _key, _value in _TEST_SETTINGS.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,120 @@
+import unittest
+
+from src.processors.hr_sheet import extract_kv_lines, parse_date, parse_hr_rows
+
+
+class ParseHrRowsTest(unittest.TestCase):
+    def test_empty(self) -> None:
+        self.assertEqual(parse_hr_rows([]), ({}, []))
+
+    def test_headers_are_normalized(self) -> None:
+        columns, rows = parse_hr_rows([[" Имя ", "ПОЗИЦИЯ"], ["Анна", "QA"]])
+        self.assertEqual(columns, {"имя": (0,), "позиция": (1,)})
+        self.assertEqual(rows, [["Анна", "QA"]])
+
+    def test_repeated_headers_list_last_column_first(self) -> None:
+        columns, _ = parse_hr_rows([["Дата", "Имя", "дата"]])
+        self.assertEqual(columns["дата"], (2, 0))
+
+
+class ExtractKvLinesTest(unittest.TestCase):
+    def extract(self, values: list[list[str]]) -> list[tuple[str, str | None]]:
+        columns, rows = parse_hr_rows(values)
+        return extract_kv_lines(rows, columns)
+
+    def test_full_row(self) -> None:
+        lines = self.extract(
+            [
+                [
+                    "Имя",
+                    "Текущая позиция",
+                    "Направление",
+                    "Тимлид",
+                    "Дата начала работы",
+                    "Конец ИС",
+                    "ИС пройден",
+                    "Увольнение",
+                    "Дата",
+                    "Причина увольнения",
+                ],
+                [
+                    "Анна",
+                    "QA",
+                    "Testing",
+                    "Иван",
+                    "01.02.2024",
+                    "01.05.2024",
+                    "да",
+                    "уволен",
+                    "2025-01-31",
+                    "переезд",
+                ],
+            ]
+        )
+        self.assertEqual(
+            lines,
+            [
+                (
+                    "person: Анна; current_position: QA; department: Testing; "
+                    "team_lead: Иван; start_date: 01.02.2024; "
+                    "probation_end: 01.05.2024; probation_passed: да; "
+                    "termination_status: уволен; termination_date: 2025-01-31; "
+                    "termination_reason: переезд",
+                    "01.02.2024",
+                )
+            ],
+        )
+
+    def test_rows_without_name_are_skipped(self) -> None:
+        self.assertEqual(self.extract([["Имя", "Позиция"], ["", "QA"]]), [])
+
+    def test_alias_headers_are_fallbacks(self) -> None:
+        lines = self.extract(
+            [
+                ["Name", "Позиция", "Начало ИС", "Дата расторжения договора"],
+                ["Bob", "Dev", "2024-03-01", "2024-09-01"],
+            ]
+        )
+        self.assertEqual(
+            lines,
+            [
+                (
+                    "person: Bob; current_position: Dev; start_date: 2024-03-01; "
+                    "termination_date: 2024-09-01",
+                    "2024-03-01",
+                )
+            ],
+        )
+
+    def test_short_rows_and_unknown_probation_status(self) -> None:
+        lines = self.extract(
+            [["Имя", "Конец ИС", "ИС пройден", "Дата"], ["Анна", "01.05.2024"]]
+        )
+        self.assertEqual(
+            lines,
+            [
+                (
+                    "person: Анна; probation_end: 01.05.2024; probation_passed: unknown",
+                    None,
+                )
+            ],
+        )
+
+    def test_repeated_header_uses_last_column(self) -> None:
+        lines = self.extract([["Имя", "Тимлид", "Тимлид"], ["Анна", "старый", "новый"]])
+        self.assertEqual(lines[0][0], "person: Анна; team_lead: новый")
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_formats(self) -> None:
+        self.assertEqual(parse_date("2024-02-01"), "2024-02-01")
+        self.assertEqual(parse_date(" 01.02.2024 "), "2024-02-01")
+
+    def test_unparseable(self) -> None:
+        for value in (None, "", "1.2.2024", "2024/02/01", "завтра"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_date(value))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import re
+import unittest
+
+import markdown
+from bs4 import BeautifulSoup
+
+from src.processors.mattermost import clean_text
+
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text as it was before the regex rewrite: markdown -> HTML -> text."""
+    if not text:
+        return ""
+    html = markdown.markdown(text)
+    plain_text = BeautifulSoup(html, "html.parser").get_text(separator=" ")
+    plain_text = re.sub(r"@[a-zA-Z0-9_.]+", "", plain_text)
+    plain_text = re.sub(r"[😀-🙏🌀-🗿🚀-🛿🇠-🇿🤀-🧿☀-➿]+", "", plain_text)
+    return re.sub(r"\s+", " ", plain_text).strip()
+
+
+class CleanTextLegacyParityTest(unittest.TestCase):
+    """Messages whose cleaned text must not change compared to the old pipeline."""
+
+    SAMPLES = (
+        "plain message",
+        "a < b > c",
+        "x -> y <- z",
+        "if a<b and c>d",
+        "1 < 2",
+        "a <3 b",
+        "<>",
+        "foo__bar__baz",
+        "snake_case_name",
+        "x_1 and y_2",
+        "**bold** text",
+        "**bold with [link](http://example.com)**",
+        "[link](http://x.y) end",
+        "<b>bold</b> tag",
+        "tag <br> mid",
+        "<http://example.com>",
+        "`code *x*`",
+        "# Title\nbody",
+        "> quote\nnext",
+        "@user hi 😀 there",
+        "2 * 3 * 4",
+        "a * b",
+        "5*3=15",
+        r"C:\Users\me\file",
+        "path/to/*.py",
+        "**unterminated",
+        "~~not closed",
+        "text_with_trailing_",
+        r"\*escaped\*",
+        r"back\\slash",
+        "*it* and _it_",
+        "***both***",
+        "__bold__ and ___x___",
+        "** spaced **",
+        "*a\n\nb*",
+        "mail <a@b.c> here",
+        "a*b",
+        "word~~x~~word",
+        "```py\ncode",
+        "``a ` b``",
+        "[t](http://x/(y))",
+        "[a](b) and [c](d (e) f)",
+    )
+
+    def test_matches_legacy_pipeline(self) -> None:
+        for sample in self.SAMPLES:
+            with self.subTest(sample=sample):
+                self.assertEqual(clean_text(sample), legacy_clean_text(sample))
+
+    # The old pipeline read markers inside a word as emphasis and split the word,
+    # e.g. "2*3*4" became "2 3 4"; such text is now kept as written.
+    KEPT_INSIDE_WORDS = ("2*3*4", "a*b*c", "http://x.com/a*b*c", "x *a*b")
+
+    def test_markers_inside_words_differ_from_legacy(self) -> None:
+        for sample in self.KEPT_INSIDE_WORDS:
+            with self.subTest(sample=sample):
+                self.assertEqual(clean_text(sample), sample)
+                self.assertNotEqual(legacy_clean_text(sample), sample)
+
+
+class CleanTextTest(unittest.TestCase):
+    def test_empty(self) -> None:
+        self.assertEqual(clean_text(""), "")
+
+    def test_keeps_angle_brackets_that_are_not_tags(self) -> None:
+        self.assertEqual(clean_text("a < b > c"), "a < b > c")
+
+    def test_strips_html_tags(self) -> None:
+        self.assertEqual(clean_text("<b>bold</b> and <br/>break"), "bold and break")
+
+    def test_keeps_autolink_address(self) -> None:
+        self.assertEqual(
+            clean_text("see <https://example.com/a>"), "see https://example.com/a"
+        )
+
+    def test_strong_emphasis_needs_word_boundaries(self) -> None:
+        self.assertEqual(clean_text("foo__bar__baz"), "foo__bar__baz")
+        self.assertEqual(clean_text("__bold__ and **strong**"), "bold and strong")
+
+    def test_unpaired_markers_are_kept(self) -> None:
+        self.assertEqual(clean_text("path/to/*.py"), "path/to/*.py")
+        self.assertEqual(clean_text("**unterminated"), "**unterminated")
+        self.assertEqual(clean_text("text_with_trailing_"), "text_with_trailing_")
+        self.assertEqual(clean_text("__init__.py"), "__init__.py")
+        self.assertEqual(clean_text("2*3*4"), "2*3*4")
+
+    def test_escaped_markers_are_unescaped(self) -> None:
+        self.assertEqual(clean_text(r"\*escaped\*"), "*escaped*")
+
+    def test_paired_markers_keep_their_text(self) -> None:
+        self.assertEqual(clean_text("*it* _it_ ~~gone~~"), "it it gone")
+        self.assertEqual(clean_text("***both*** and **a *b* c**"), "both and a b c")
+
+    def test_fenced_code_drops_language_tag(self) -> None:
+        self.assertEqual(clean_text("```python\nprint(1)\n```"), "print(1)")
+
+    def test_removes_mentions_and_emoji(self) -> None:
+        self.assertEqual(clean_text("@ivan.petrov привет 👋 🚀"), "привет")
+
+
+if __name__ == "__main__":
+    unittest.main()
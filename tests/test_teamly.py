@@ -0,0 +1,100 @@
+import base64
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.constants import TEAMLY_REQUEST_INTERVAL
+from src.processors.teamly import (
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    TeamlyProcessor,
+    _jwt_expiry,
+    clean_text,
+)
+
+
+def bare_processor() -> TeamlyProcessor:
+    # The settings- and token-dependent __init__ is skipped; tests set what they use.
+    return TeamlyProcessor.__new__(TeamlyProcessor)
+
+
+def make_jwt(payload: object) -> str:
+    def encode(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    header = encode(b'{"alg":"HS256","typ":"JWT"}')
+    return f"{header}.{encode(json.dumps(payload).encode())}.signature"
+
+
+class ThrottleTest(unittest.TestCase):
+    def test_calls_are_spaced_across_the_client(self) -> None:
+        processor = bare_processor()
+        processor._throttle_lock = threading.Lock()
+        processor._next_request_at = 0.0
+        with (
+            mock.patch("src.processors.teamly.time.monotonic", return_value=100.0),
+            mock.patch("src.processors.teamly.time.sleep") as sleep,
+        ):
+            for _ in range(3):
+                processor._throttle()
+        # The first call goes out at once, the next ones wait for their slot.
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(waits[0], TEAMLY_REQUEST_INTERVAL)
+        self.assertAlmostEqual(waits[1], 2 * TEAMLY_REQUEST_INTERVAL)
+
+
+class JwtExpiryTest(unittest.TestCase):
+    def test_reads_exp_claim(self) -> None:
+        self.assertEqual(_jwt_expiry(make_jwt({"exp": 1700000000})), 1700000000.0)
+
+    def test_tokens_without_exp(self) -> None:
+        for token in (
+            None,
+            "",
+            "opaque-token",
+            "a.b",
+            "a.!!!.c",
+            make_jwt({"sub": "user"}),
+            make_jwt({"exp": "soon"}),
+            make_jwt([1, 2, 3]),
+        ):
+            with self.subTest(token=token):
+                self.assertIsNone(_jwt_expiry(token))
+
+
+class TokenExpiringTest(unittest.TestCase):
+    def processor(self, expiry: float | None) -> TeamlyProcessor:
+        processor = bare_processor()
+        processor._token_expiry = expiry
+        return processor
+
+    def test_unknown_expiry_is_never_expiring(self) -> None:
+        self.assertFalse(self.processor(None)._token_expiring())
+
+    def test_valid_token(self) -> None:
+        expiry = time.time() + TOKEN_REFRESH_MARGIN_SECONDS + 60
+        self.assertFalse(self.processor(expiry)._token_expiring())
+
+    def test_token_within_refresh_margin(self) -> None:
+        expiry = time.time() + TOKEN_REFRESH_MARGIN_SECONDS / 2
+        self.assertTrue(self.processor(expiry)._token_expiring())
+
+    def test_expired_token(self) -> None:
+        self.assertTrue(self.processor(time.time() - 1)._token_expiring())
+
+
+class TeamlyCleanTextTest(unittest.TestCase):
+    def test_collapses_whitespace(self) -> None:
+        self.assertEqual(clean_text("  a \n\t b  "), "a b")
+
+    def test_strips_emoji_and_keeps_cyrillic(self) -> None:
+        self.assertEqual(clean_text("Привет 👋 мир ✅⌚"), "Привет мир")
+
+    def test_empty(self) -> None:
+        self.assertEqual(clean_text(""), "")
+
+
+if __name__ == "__main__":
+    unittest.main()